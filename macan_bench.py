@@ -0,0 +1,303 @@
+"""
+Macan Chess - Benchmark Suite
+Mengukur performa rules, AI, mate solver, save/load, jurnal, dan rendering papan (offscreen).
+
+Pemakaian:
+    python macan_bench.py                     # jalankan & bandingkan dengan baseline
+    python macan_bench.py --update-baseline   # simpan hasil sebagai baseline baru
+    python macan_bench.py --threshold 0.30    # toleransi regresi 30%
+
+Setiap run ditambahkan ke file history (JSON Lines). Exit code 1 jika ada
+metrik yang lebih lambat dari baseline melebihi threshold.
+"""
+
+import os
+# Qt harus memakai platform offscreen sebelum QApplication dibuat
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import math
+import tempfile
+from pathlib import Path
+
+from macan_chess import ChessBoard, MateSolver, GameJournal, CHECKPOINT_INTERVAL
+
+# --- POSISI UJI ---
+# Format: susunan bidak ala FEN (huruf besar = putih) + giliran
+TEST_POSITIONS = {
+    'start': ('rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR', 'white'),
+    'italian': ('r1bqk1nr/pppp1ppp/2n5/2b1p3/2B1P3/5N2/PPPP1PPP/RNBQK2R', 'white'),
+    'middlegame': ('r2q1rk1/pp2bppp/2n1pn2/3p4/3P1B2/2PBPN2/PP3PPP/R2QK2R', 'black'),
+    'open_queens': ('3rr1k1/pp3ppp/2q5/8/3Q4/6P1/PP3PBP/3RR1K1', 'white'),
+    'endgame': ('8/5pk1/6p1/8/3R4/6P1/5PKP/3r4', 'white'),
+    'check': ('rnb1kbnr/pppp1ppp/8/4p3/5PPq/8/PPPPP2P/RNBQKBNR', 'white'),
+}
+
+DEFAULT_HISTORY = 'bench_history.jsonl'
+DEFAULT_BASELINE = 'bench_baseline.json'
+DEFAULT_THRESHOLD = 0.25
+MIN_SAMPLE_MS = 20.0       # setiap sampel diulang sampai minimal selama ini
+
+# Metrik yang menyentuh disk / Qt lebih berisik: toleransi minimum per metrik
+METRIC_THRESHOLDS = {
+    'file_roundtrip_ms': 0.5,
+    'journal_move_ms': 0.5,
+    'journal_move_long_ms': 0.5,
+    'render_frame_ms': 0.5,
+}
+
+
+def board_from_placement(placement, turn='white'):
+    """Membuat ChessBoard dari susunan bidak ala FEN"""
+    board = ChessBoard()
+    board.load_from_fen(f"{placement} {'w' if turn == 'white' else 'b'}")
+    return board
+
+
+def _measure(func, repeat, number=1):
+    """Waktu minimum (ms) per panggilan dari `repeat` sampel.
+
+    Jumlah panggilan per sampel adalah kelipatan `number` yang cukup agar satu
+    sampel berlangsung minimal MIN_SAMPLE_MS; minimum lebih stabil dari median
+    karena gangguan (GC, scheduler, disk) hanya bisa menambah waktu.
+    """
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    first_ms = (time.perf_counter() - start) * 1000
+    number *= max(1, math.ceil(MIN_SAMPLE_MS / max(first_ms, 1e-6)))
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) * 1000 / number)
+    return min(samples)
+
+
+# --- BENCHMARKS ---
+
+def bench_move_generation(repeat):
+    boards = [board_from_placement(p, t) for p, t in TEST_POSITIONS.values()]
+
+    def run():
+        for b in boards:
+            b.get_all_valid_moves(b.current_player)
+    return _measure(run, repeat)
+
+
+def bench_is_check(repeat):
+    boards = [board_from_placement(p, t) for p, t in TEST_POSITIONS.values()]
+
+    def run():
+        for b in boards:
+            b.is_check('white')
+            b.is_check('black')
+    return _measure(run, repeat, number=20)
+
+
+def bench_is_checkmate(repeat):
+    # Fool's mate + posisi skak biasa (harus cek semua jawaban)
+    boards = [
+        board_from_placement('rnb1kbnr/pppp1ppp/8/4p3/6Pq/5P2/PPPPP2P/RNBQKBNR', 'white'),
+        board_from_placement(*TEST_POSITIONS['check']),
+    ]
+
+    def run():
+        for b in boards:
+            b.is_checkmate(b.current_player)
+    return _measure(run, repeat, number=5)
+
+
+def bench_engine(repeat):
+    placement, _ = TEST_POSITIONS['middlegame']
+
+    def run():
+        random.seed(0)
+        b = board_from_placement(placement, 'black')
+        b.make_computer_move()
+    return _measure(run, repeat)
+
+
+def bench_mate_solver(repeat):
+    # Mat dalam 2 (pola Philidor): Qg8+ Rxg8 Nf7#
+    placement = '4r2k/6pp/7N/3Q4/8/8/8/6K1'
+
+    def run():
+        b = board_from_placement(placement, 'white')
+        MateSolver(b).solve('white', 3)
+    return _measure(run, repeat)
+
+
+def _played_board(plies=40):
+    """Papan dengan riwayat langkah acak (deterministik) untuk uji save/load"""
+    rng = random.Random(42)
+    b = ChessBoard()
+    for _ in range(plies):
+        moves = b.get_all_valid_moves(b.current_player)
+        if not moves:
+            break
+        (fr, fc), (tr, tc) = rng.choice(moves)
+        b.move_piece(fr, fc, tr, tc)
+    return b
+
+
+def bench_dict_roundtrip(repeat):
+    src = _played_board()
+    dst = ChessBoard()
+
+    def run():
+        dst.load_from_dict(src.to_dict())
+    return _measure(run, repeat, number=50)
+
+
+def bench_file_roundtrip(repeat):
+    src = _played_board()
+    dst = ChessBoard()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'bench_game.json'
+
+        # Sama seperti MacanChessWindow.save_game / load_game
+        def run():
+            with open(path, 'w') as f:
+                json.dump(src.to_dict(), f, indent=4)
+            with open(path, 'r') as f:
+                dst.load_from_dict(json.load(f))
+        return _measure(run, repeat, number=10)
+
+
+def _bench_journal(repeat, history_len):
+    src = _played_board()
+    # Riwayat panjang buatan: biaya per langkah tidak boleh ikut naik
+    src.move_history = (src.move_history * (history_len // len(src.move_history) + 1))[:history_len]
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = GameJournal(tmp)
+        journal.start(src)
+
+        # Rata-rata per langkah, termasuk fsync batch dan checkpoint periodik
+        def run():
+            journal.record_move(src, 6, 4, 4, 4)
+        result = _measure(run, repeat, number=CHECKPOINT_INTERVAL * 2)
+        journal.close()
+        return result
+
+
+def bench_journal(repeat):
+    return _bench_journal(repeat, 40)
+
+
+def bench_journal_long(repeat):
+    return _bench_journal(repeat, 10000)
+
+
+def bench_render(repeat):
+    from PySide6.QtWidgets import QApplication
+    from macan_chess import ChessBoardView
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    view = ChessBoardView(_played_board())
+    view.resize(800, 800)
+    view.last_move = (6, 4, 4, 4)
+
+    def run():
+        view.update_board()
+        view.viewport().repaint()
+        app.processEvents()
+    result = _measure(run, repeat, number=5)
+    view.deleteLater()
+    app.processEvents()
+    return result
+
+
+BENCHMARKS = {
+    'move_generation_ms': bench_move_generation,
+    'is_check_ms': bench_is_check,
+    'is_checkmate_ms': bench_is_checkmate,
+    'engine_move_ms': bench_engine,
+    'mate_solve_ms': bench_mate_solver,
+    'dict_roundtrip_ms': bench_dict_roundtrip,
+    'file_roundtrip_ms': bench_file_roundtrip,
+    'journal_move_ms': bench_journal,
+    'journal_move_long_ms': bench_journal_long,
+    'render_frame_ms': bench_render,
+}
+
+
+# --- HISTORY / BASELINE ---
+
+def run_benchmarks(names, repeat):
+    results = {}
+    for name in names:
+        results[name] = round(BENCHMARKS[name](repeat), 4)
+        print(f"{name:<22} {results[name]:>10.3f} ms")
+    return results
+
+
+def append_history(path, results):
+    record = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'metrics': results,
+    }
+    with open(path, 'a') as f:
+        f.write(json.dumps(record) + '\n')
+
+
+def compare_with_baseline(results, baseline, threshold):
+    """Kembalikan daftar (metrik, baseline, sekarang) yang mengalami regresi"""
+    regressions = []
+    for name, value in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        limit = max(threshold, METRIC_THRESHOLDS.get(name, 0))
+        if value > base * (1 + limit):
+            regressions.append((name, base, value))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Macan Chess performance benchmarks")
+    parser.add_argument('--history', default=DEFAULT_HISTORY, help="file JSON Lines untuk riwayat hasil")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="file JSON baseline")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="toleransi regresi relatif (0.25 = 25%%)")
+    parser.add_argument('--repeat', type=int, default=7, help="jumlah pengukuran per metrik")
+    parser.add_argument('--update-baseline', action='store_true', help="simpan hasil sebagai baseline")
+    parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS), help="hanya jalankan metrik tertentu")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.only or list(BENCHMARKS), args.repeat)
+    append_history(args.history, results)
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=4)
+        print(f"Baseline disimpan ke {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"Baseline {args.baseline} belum ada, jalankan dengan --update-baseline")
+        return 0
+
+    with open(args.baseline, 'r') as f:
+        baseline = json.load(f)
+
+    regressions = compare_with_baseline(results, baseline, args.threshold)
+    for name, base, value in regressions:
+        print(f"REGRESI {name}: {base:.3f} ms -> {value:.3f} ms (+{(value / base - 1) * 100:.0f}%)")
+    if regressions:
+        return 1
+    print("Tidak ada regresi.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
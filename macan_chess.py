@@ -8,6 +8,9 @@ import sys
 import json
 import random
 import os
+import time
+import zlib
+import struct
 from pathlib import Path
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                                QHBoxLayout, QGraphicsView, QGraphicsScene, 
@@ -162,31 +165,34 @@ class ChessBoard:
                 
         return legal_moves
 
-    def _would_be_in_check(self, fr, fc, tr, tc):
-        """Simulasi gerakan untuk cek legalitas"""
+    def _make_temp_move(self, fr, fc, tr, tc):
+        """Gerakan sementara (tanpa notasi/captured/giliran). Return data untuk _undo_temp_move"""
         piece = self.board[fr][fc]
         target = self.board[tr][tc]
+        undo = (target, piece.pos, self.king_positions[piece.color])
         
-        # Simpan state lama
-        original_pos = piece.pos
-        old_king_pos = self.king_positions[piece.color]
-        
-        # Lakukan gerakan sementara
         self.board[tr][tc] = piece
         self.board[fr][fc] = None
         piece.pos = (tr, tc)
         if piece.type.upper() == 'K':
             self.king_positions[piece.color] = (tr, tc)
-            
-        # Cek apakah raja diserang
-        in_check = self.is_check(piece.color)
-        
-        # Kembalikan state
+        return undo
+
+    def _undo_temp_move(self, fr, fc, tr, tc, undo):
+        """Kembalikan state sebelum _make_temp_move"""
+        target, original_pos, old_king_pos = undo
+        piece = self.board[tr][tc]
         self.board[fr][fc] = piece
         self.board[tr][tc] = target
         piece.pos = original_pos
         self.king_positions[piece.color] = old_king_pos
-        
+
+    def _would_be_in_check(self, fr, fc, tr, tc):
+        """Simulasi gerakan untuk cek legalitas"""
+        color = self.board[fr][fc].color
+        undo = self._make_temp_move(fr, fc, tr, tc)
+        in_check = self.is_check(color)
+        self._undo_temp_move(fr, fc, tr, tc, undo)
         return in_check
 
     def is_check(self, color_to_check):
@@ -228,6 +234,20 @@ class ChessBoard:
                             if not path_blocked: return True
         return False
 
+    def _gives_check(self, fr, fc, tr, tc):
+        """Simulasi gerakan: apakah raja lawan jadi diserang?"""
+        opponent = 'black' if self.board[fr][fc].color == 'white' else 'white'
+        undo = self._make_temp_move(fr, fc, tr, tc)
+        gives_check = self.is_check(opponent)
+        self._undo_temp_move(fr, fc, tr, tc, undo)
+        return gives_check
+
+    def is_sharp_position(self, color):
+        """Posisi tajam: raja sedang diserang atau ada langkah yang memberi skak"""
+        if self.is_check(color):
+            return True
+        return any(self._gives_check(fr, fc, tr, tc) for (fr, fc), (tr, tc) in self.get_all_valid_moves(color))
+
     def is_checkmate(self, color):
         if not self.is_check(color): return False
         for r in range(8):
@@ -270,12 +290,25 @@ class ChessBoard:
         return True, is_mate
 
     # --- AI LOGIC (FIXED) ---
-    def make_computer_move(self):
-        """Logika sederhana AI - Return tuple (koordinat_gerakan, is_mate)"""
+    def make_computer_move(self, time_limit=None):
+        """Logika sederhana AI - Return tuple (koordinat_gerakan, is_mate)
+
+        time_limit (detik, opsional) membatasi waktu pencarian mat.
+        """
         moves = self.get_all_valid_moves('black')
         if not moves: 
             return None, False
 
+        # Posisi tajam: coba cari mat paksa dulu
+        if self.is_sharp_position('black'):
+            search_time = MATE_SEARCH_TIME if time_limit is None else min(MATE_SEARCH_TIME, time_limit / 2)
+            solver = MateSolver(self, max_nodes=MATE_SEARCH_NODES, time_limit=search_time)
+            status, mate_move, _ = solver.solve('black')
+            if status == 'proven':
+                fr, fc, tr, tc = mate_move
+                success, is_mate = self.move_piece(fr, fc, tr, tc)
+                return mate_move, is_mate
+
         values = {'P': 1, 'N': 3, 'B': 3, 'R': 5, 'Q': 9, 'K': 100}
         
         best_move = None
@@ -351,6 +384,449 @@ class ChessBoard:
         self.captured_pieces['white'] = [ChessPiece(t, 'black', (0,0)) for t in data['captured_w']]
         self.captured_pieces['black'] = [ChessPiece(t, 'white', (0,0)) for t in data['captured_b']]
 
+    def load_from_fen(self, fen):
+        """Memuat posisi dari FEN (hanya susunan bidak dan giliran yang dipakai)"""
+        fields = fen.split()
+        ranks = fields[0].split('/') if fields else []
+        if len(ranks) != 8:
+            raise ValueError(f"Invalid FEN: {fen!r}")
+
+        self.board = [[None for _ in range(8)] for _ in range(8)]
+        self.captured_pieces = {'white': [], 'black': []}
+        self.move_history = []
+        self.current_player = 'black' if len(fields) > 1 and fields[1] == 'b' else 'white'
+
+        kings = {'white': [], 'black': []}
+        for r, rank in enumerate(ranks):
+            c = 0
+            for ch in rank:
+                if ch in '12345678':
+                    c += int(ch)
+                    continue
+                if ch.upper() not in ANIMAL_NAMES or c > 7:
+                    raise ValueError(f"Invalid FEN: {fen!r}")
+                color = 'white' if ch.isupper() else 'black'
+                self.board[r][c] = ChessPiece(ch.upper(), color, (r, c))
+                if ch.upper() == 'K':
+                    kings[color].append((r, c))
+                c += 1
+            if c != 8:
+                raise ValueError(f"Invalid FEN (rank {r + 1} has {c} files): {fen!r}")
+
+        # Tanpa tepat satu raja per warna, is_check/solver membaca petak raja yang salah
+        for color, squares in kings.items():
+            if len(squares) != 1:
+                raise ValueError(f"Invalid FEN ({color} must have exactly one king): {fen!r}")
+            self.king_positions[color] = squares[0]
+
+
+# --- MATE SOLVER ---
+MATE_SEARCH_MOVES = 3        # AI mencari mat paksa sampai N langkah
+MATE_SEARCH_NODES = 2000     # batas node per pencarian AI
+MATE_SEARCH_TIME = 0.25      # batas waktu pencarian AI (detik) agar UI tetap responsif
+PN_INF = 10 ** 9
+
+_zobrist_rng = random.Random(20240611)
+ZOBRIST_PIECES = {(t, color, r, c): _zobrist_rng.getrandbits(64)
+                  for t in 'KQRBNP' for color in ('white', 'black')
+                  for r in range(8) for c in range(8)}
+ZOBRIST_BLACK_TO_MOVE = _zobrist_rng.getrandbits(64)
+
+
+class _MateSearchAborted(Exception):
+    pass
+
+
+class MateSolver:
+    """Pencari mat paksa berbasis depth-first proof-number search (df-pn).
+
+    Node OR = giliran penyerang, node AND = giliran bertahan. Nilai (phi, delta)
+    disimpan dalam bentuk negamax per (hash Zobrist, sisa ply) di tabel
+    transposisi berukuran terbatas. Papan diubah sementara selama pencarian
+    dan selalu dikembalikan seperti semula.
+    """
+    def __init__(self, chess_board, max_nodes=None, max_entries=200000, time_limit=None):
+        self.chess_board = chess_board
+        self.max_nodes = max_nodes
+        self.max_entries = max_entries
+        self.time_limit = time_limit
+        self.deadline = None
+        self.table = {}
+        self.nodes = 0
+        self.hash = 0
+
+    def solve(self, color, max_moves=MATE_SEARCH_MOVES):
+        """Cari mat untuk `color` dalam <= max_moves langkah.
+
+        Return (status, move, mate_in): status 'proven', 'disproven' atau
+        'unknown' (batas node/waktu habis); move = (fr, fc, tr, tc) jika proven.
+        """
+        self.attacker = color
+        self.defender = 'black' if color == 'white' else 'white'
+        self.hash = self._position_hash(color)
+        self.nodes = 0
+        self.deadline = None if self.time_limit is None else time.perf_counter() + self.time_limit
+        try:
+            # Iterative deepening: mat terpendek selalu ditemukan lebih dulu
+            for n in range(1, max_moves + 1):
+                phi, delta, move = self._mid(2 * n - 1, PN_INF, PN_INF, True)
+                if phi == 0:
+                    return 'proven', move, n
+        except _MateSearchAborted:
+            return 'unknown', None, None
+        return 'disproven', None, None
+
+    # --- HASH & GERAKAN SEMENTARA ---
+    def _position_hash(self, side_to_move):
+        h = ZOBRIST_BLACK_TO_MOVE if side_to_move == 'black' else 0
+        for r in range(8):
+            for c in range(8):
+                p = self.chess_board.board[r][c]
+                if p:
+                    h ^= ZOBRIST_PIECES[(p.type.upper(), p.color, r, c)]
+        return h
+
+    def _child_hash(self, fr, fc, tr, tc):
+        board = self.chess_board.board
+        piece = board[fr][fc]
+        target = board[tr][tc]
+        t = piece.type.upper()
+        h = self.hash ^ ZOBRIST_BLACK_TO_MOVE
+        h ^= ZOBRIST_PIECES[(t, piece.color, fr, fc)] ^ ZOBRIST_PIECES[(t, piece.color, tr, tc)]
+        if target:
+            h ^= ZOBRIST_PIECES[(target.type.upper(), target.color, tr, tc)]
+        return h
+
+    def _make(self, fr, fc, tr, tc):
+        old_hash = self.hash
+        self.hash = self._child_hash(fr, fc, tr, tc)
+        return old_hash, self.chess_board._make_temp_move(fr, fc, tr, tc)
+
+    def _unmake(self, fr, fc, tr, tc, undo):
+        self.hash, board_undo = undo
+        self.chess_board._undo_temp_move(fr, fc, tr, tc, board_undo)
+
+    # --- TABEL TRANSPOSISI ---
+    def _store(self, key, phi, delta, move=None):
+        if len(self.table) >= self.max_entries and key not in self.table:
+            # Buang node yang belum terbukti; kalau masih penuh, kosongkan tabel
+            self.table = {k: v for k, v in self.table.items() if v[0] == 0 or v[1] == 0}
+            if len(self.table) >= self.max_entries // 2:
+                self.table = {}
+        self.table[key] = (phi, delta, move)
+
+    # --- DF-PN ---
+    def _mid(self, depth, phi_th, delta_th, is_or):
+        """Return (phi, delta, move) node ini; move hanya terisi jika phi == 0"""
+        key = (self.hash, depth)
+        entry = self.table.get(key)
+        if entry and (entry[0] >= phi_th or entry[1] >= delta_th):
+            return entry
+
+        self.nodes += 1
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise _MateSearchAborted()
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise _MateSearchAborted()
+
+        cb = self.chess_board
+        side = self.attacker if is_or else self.defender
+
+        # Ply habis: penyerang gagal, kecuali posisi bertahan sudah mat.
+        # (PN_INF, 0) = pihak yang jalan kalah, (0, PN_INF) = pihak yang jalan menang.
+        if depth == 0:
+            result = (PN_INF, 0) if is_or or cb.is_checkmate(side) else (0, PN_INF)
+            self._store(key, *result)
+            return result + (None,)
+
+        moves = cb.get_all_valid_moves(side)
+        if not moves:
+            # Pihak yang jalan kalah jika: penyerang tidak bisa jalan, atau bertahan kena mat.
+            # Bertahan stalemate = penyerang gagal.
+            result = (PN_INF, 0) if is_or or cb.is_check(side) else (0, PN_INF)
+            self._store(key, *result)
+            return result + (None,)
+
+        # Nilai anak disimpan lokal: entri tabel bisa dibuang saat tabel penuh,
+        # dan membaca ulang (1, 1) untuk anak yang sudah dicari membuat pencarian berputar
+        children = []
+        for (fr, fc), (tr, tc) in moves:
+            child = self.table.get((self._child_hash(fr, fc, tr, tc), depth - 1))
+            children.append((child[0], child[1]) if child else (1, 1))
+        while True:
+            phi, delta = PN_INF, 0
+            best, delta2 = 0, PN_INF
+            for i, (c_phi, c_delta) in enumerate(children):
+                if c_delta < phi:
+                    delta2 = phi
+                    phi, best = c_delta, i
+                elif c_delta < delta2:
+                    delta2 = c_delta
+                delta = min(PN_INF, delta + c_phi)
+
+            if phi >= phi_th or delta >= delta_th:
+                (fr, fc), (tr, tc) = moves[best]
+                move = (fr, fc, tr, tc) if phi == 0 else None
+                self._store(key, phi, delta, move)
+                return phi, delta, move
+
+            best_phi = children[best][0]
+            child_phi_th = PN_INF if delta_th >= PN_INF else delta_th - delta + best_phi
+            child_delta_th = min(phi_th, delta2 + 1)
+
+            self._store(key, phi, delta)
+            (fr, fc), (tr, tc) = moves[best]
+            undo = self._make(fr, fc, tr, tc)
+            try:
+                c_phi, c_delta, _ = self._mid(depth - 1, child_phi_th, child_delta_th, not is_or)
+                children[best] = (c_phi, c_delta)
+            finally:
+                self._unmake(fr, fc, tr, tc, undo)
+
+
+# --- GAME JOURNAL ---
+JOURNAL_MAGIC = b'MCJ1'
+JOURNAL_HEADER = struct.Struct('<4sQ')     # magic, epoch
+JOURNAL_MOVE = struct.Struct('<IBBBB')     # seq, from_row, from_col, to_row, to_col
+JOURNAL_CRC = struct.Struct('<I')
+JOURNAL_RECORD_SIZE = JOURNAL_MOVE.size + JOURNAL_CRC.size
+CHECKPOINT_INTERVAL = 32     # checkpoint penuh setiap N langkah
+FSYNC_BATCH = 8              # fsync setiap N langkah...
+FSYNC_INTERVAL = 2.0         # ...atau setiap N detik
+
+
+def get_data_dir():
+    base = os.environ.get('LOCALAPPDATA') or os.path.join(Path.home(), '.local', 'share')
+    return Path(base) / 'MacanChess'
+
+
+class GameJournal:
+    """Jurnal append-only agar permainan bisa dilanjutkan setelah crash.
+
+    Setiap langkah ditulis sebagai record 12 byte (seq, koordinat, CRC32) ke
+    file jurnal, dan notasinya ditambahkan ke file history (satu JSON per
+    baris). Setiap CHECKPOINT_INTERVAL langkah, to_dict tanpa history ditulis
+    atomik ke file checkpoint beserta offset jurnal dan jumlah baris history
+    saat itu, sehingga biaya tulis per langkah tidak bergantung pada panjang
+    permainan. Resume = load checkpoint lalu replay record setelah offset
+    tersebut. Epoch acak di header jurnal, nama file history dan checkpoint
+    mencegah replay record dari permainan lain.
+    """
+    def __init__(self, directory=None):
+        self.directory = Path(directory) if directory else get_data_dir()
+        self.journal_path = self.directory / 'current.journal'
+        self.checkpoint_path = self.directory / 'current.checkpoint.json'
+        self.file = None
+        self.history_file = None
+        self.history_len = 0
+        self.epoch = 0
+        self.seq = 0
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+
+    def start(self, chess_board):
+        """Mulai jurnal baru dari posisi papan sekarang (game baru / load / resume)"""
+        self.close()
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self.epoch = random.getrandbits(63)
+            self.seq = 0
+            # History lengkap hanya ditulis di sini (sekali per game/load/resume),
+            # ke file baru per epoch supaya checkpoint lama tetap valid sampai diganti
+            self.history_file = open(self._history_path(self.epoch), 'w', encoding='utf-8')
+            for notation in chess_board.move_history:
+                self.history_file.write(json.dumps(notation) + '\n')
+            self.history_len = len(chess_board.move_history)
+            self.history_file.flush()
+            os.fsync(self.history_file.fileno())
+            # Checkpoint dulu: jika crash sebelum header baru tertulis, epoch lama
+            # tidak cocok dan tidak ada record lama yang ikut di-replay
+            self._write_checkpoint(chess_board, JOURNAL_HEADER.size)
+            self._remove_history_files(keep=self._history_path(self.epoch))
+            self.file = open(self.journal_path, 'wb')
+            self.file.write(JOURNAL_HEADER.pack(JOURNAL_MAGIC, self.epoch))
+            self._sync()
+        except OSError:
+            self._disable()
+
+    def record_move(self, chess_board, fr, fc, tr, tc):
+        """Dipanggil setelah move_piece berhasil"""
+        if self.file is None:
+            return
+        try:
+            self.history_file.write(json.dumps(chess_board.move_history[-1]) + '\n')
+            self.history_file.flush()
+            self.history_len += 1
+            body = JOURNAL_MOVE.pack(self.seq, fr, fc, tr, tc)
+            self.file.write(body + JOURNAL_CRC.pack(zlib.crc32(body)))
+            self.file.flush()
+            self.seq += 1
+            self.unsynced += 1
+            if self.seq % CHECKPOINT_INTERVAL == 0:
+                self._sync()
+                self._write_checkpoint(chess_board, self.file.tell())
+            elif self.unsynced >= FSYNC_BATCH or time.monotonic() - self.last_sync >= FSYNC_INTERVAL:
+                self._sync()
+        except OSError:
+            self._disable()
+
+    def resume(self, chess_board):
+        """Pulihkan permainan terakhir ke chess_board.
+
+        Return daftar langkah yang di-replay dari jurnal, atau None jika tidak
+        ada permainan yang bisa dilanjutkan. Checkpoint yang rusak tidak boleh
+        menggagalkan startup: papan dikembalikan ke posisi awal.
+        """
+        try:
+            with open(self.checkpoint_path, 'r') as f:
+                checkpoint = json.load(f)
+            state = checkpoint['state']
+            moves = self._read_tail(checkpoint)
+            history = self._read_history(checkpoint)
+            if not history and not moves:
+                return None
+            chess_board.load_from_dict(dict(state, history=history))
+            if chess_board.current_player not in ('white', 'black'):
+                raise ValueError("invalid turn in checkpoint")
+            # Bidak tak dikenal baru gagal saat digambar (get_symbol) dan memblokir startup
+            pieces = [p for row in chess_board.board for p in row if p]
+            pieces += chess_board.captured_pieces['white'] + chess_board.captured_pieces['black']
+            for p in pieces:
+                if not isinstance(p.type, str) or p.type.upper() not in ANIMAL_NAMES or p.color not in ('white', 'black'):
+                    raise ValueError("invalid piece in checkpoint")
+            for color, (r, c) in chess_board.king_positions.items():
+                king = chess_board.get_piece(r, c)
+                if not king or king.type.upper() != 'K' or king.color != color:
+                    raise ValueError("missing king in checkpoint")
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, IndexError, TypeError, AttributeError, struct.error):
+            # load_from_dict bisa gagal di tengah jalan: jangan tinggalkan papan setengah termuat
+            chess_board.init_board()
+            return None
+
+        replayed = []
+        for fr, fc, tr, tc in moves:
+            piece = chess_board.get_piece(fr, fc)
+            if not piece or piece.color != chess_board.current_player or (tr, tc) not in chess_board.get_valid_moves(fr, fc):
+                break
+            chess_board.move_piece(fr, fc, tr, tc)
+            replayed.append((fr, fc, tr, tc))
+
+        # Lanjutkan dengan jurnal baru berbasis posisi hasil resume
+        self.start(chess_board)
+        return replayed
+
+    def sync_pending(self):
+        """Fsync langkah yang belum tersimpan; dipanggil timer UI setiap FSYNC_INTERVAL"""
+        if self.file is None or self.unsynced == 0:
+            return
+        try:
+            self._sync()
+        except OSError:
+            self._disable()
+
+    def finish(self):
+        """Permainan selesai: tidak ada lagi yang perlu dipulihkan"""
+        self.close()
+        for path in (self.journal_path, self.checkpoint_path):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+        self._remove_history_files()
+
+    def close(self):
+        if self.file is None:
+            return
+        try:
+            self._sync()
+        except OSError:
+            pass
+        self._disable()
+
+    def _history_path(self, epoch):
+        return self.directory / f'current.{epoch:016x}.history'
+
+    def _remove_history_files(self, keep=None):
+        for path in self.directory.glob('current.*.history'):
+            if path != keep:
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+    def _read_history(self, checkpoint):
+        """Baris history milik checkpoint; baris sesudahnya dibuat ulang oleh replay"""
+        count = checkpoint['history_len']
+        if not isinstance(count, int) or count < 0:
+            raise ValueError("invalid history length in checkpoint")
+        if count == 0:
+            return []
+        history = []
+        with open(self._history_path(checkpoint['epoch']), 'r', encoding='utf-8') as f:
+            for _ in range(count):
+                line = f.readline()
+                if not line.endswith('\n'):
+                    raise ValueError("history file shorter than checkpoint")
+                history.append(json.loads(line))
+        return history
+
+    def _read_tail(self, checkpoint):
+        moves = []
+        if not self.journal_path.exists():
+            return moves  # crash di antara checkpoint dan header jurnal baru
+        with open(self.journal_path, 'rb') as f:
+            header = f.read(JOURNAL_HEADER.size)
+            if len(header) < JOURNAL_HEADER.size or JOURNAL_HEADER.unpack(header) != (JOURNAL_MAGIC, checkpoint['epoch']):
+                return moves
+            f.seek(checkpoint['offset'])
+            seq = checkpoint['seq']
+            while True:
+                record = f.read(JOURNAL_RECORD_SIZE)
+                if len(record) < JOURNAL_RECORD_SIZE:
+                    break  # record terakhir terpotong saat crash
+                body = record[:JOURNAL_MOVE.size]
+                (crc,) = JOURNAL_CRC.unpack(record[JOURNAL_MOVE.size:])
+                rec_seq, fr, fc, tr, tc = JOURNAL_MOVE.unpack(body)
+                if crc != zlib.crc32(body) or rec_seq != seq:
+                    break
+                moves.append((fr, fc, tr, tc))
+                seq += 1
+        return moves
+
+    def _write_checkpoint(self, chess_board, offset):
+        # Tanpa history: ukuran checkpoint konstan, history ada di file history
+        state = {k: v for k, v in chess_board.to_dict().items() if k != 'history'}
+        data = {'epoch': self.epoch, 'offset': offset, 'seq': self.seq,
+                'history_len': self.history_len, 'state': state}
+        tmp_path = self.checkpoint_path.with_name(self.checkpoint_path.name + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _sync(self):
+        # History dulu: checkpoint berikutnya bergantung pada baris-baris ini
+        self.history_file.flush()
+        os.fsync(self.history_file.fileno())
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+
+    def _disable(self):
+        # Jurnal gagal ditulis (disk penuh / tanpa izin): permainan tetap jalan tanpa jurnal
+        for f in (self.file, self.history_file):
+            if f is not None:
+                try:
+                    f.close()
+                except OSError:
+                    pass
+        self.file = None
+        self.history_file = None
+
 
 # --- UI CLASSES ---
 
@@ -551,6 +1027,7 @@ class MacanChessWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.chess_board = ChessBoard()
+        self.journal = GameJournal()
         
         self.setWindowTitle("Macan Chess - Tiger's Strategy")
         self.setStyleSheet("""
@@ -564,7 +1041,14 @@ class MacanChessWindow(QMainWindow):
         """)
         
         self.setup_ui()
-        self.ask_game_mode()
+
+        # Langkah terakhir tetap ter-fsync walau pemain berhenti sebelum FSYNC_BATCH tercapai
+        self.journal_timer = QTimer(self)
+        self.journal_timer.timeout.connect(self.journal.sync_pending)
+        self.journal_timer.start(int(FSYNC_INTERVAL * 1000))
+
+        if not self.resume_game():
+            self.ask_game_mode()
 
     def setup_ui(self):
         central = QWidget()
@@ -650,11 +1134,31 @@ class MacanChessWindow(QMainWindow):
                 self.status_lbl.setText("White's Turn")
         else:
             self.chess_board.game_mode = 'pvp'
+        self.journal.start(self.chess_board)
+
+    def resume_game(self):
+        """Lanjutkan permainan terakhir dari jurnal (misal setelah crash)"""
+        replayed = self.journal.resume(self.chess_board)
+        if replayed is None:
+            return False
+        self.board_view.update_board()
+        self.board_view.last_move = replayed[-1] if replayed else None
+        self.board_view.clear_selection()
+        self.update_ui()
+
+        # Crash saat komputer berpikir: lanjutkan giliran komputer
+        if self.chess_board.game_mode == 'pve' and self.chess_board.current_player == 'black':
+            self.board_view.input_enabled = False
+            self.status_lbl.setText("Black (Computer) Thinking...")
+            QTimer.singleShot(800, self.trigger_ai_move)
+        return True
 
     def on_move_made(self, is_mate):
+        self.journal.record_move(self.chess_board, *self.board_view.last_move)
         self.update_ui()
         
         if is_mate:
+            self.journal.finish()
             winner = "White" if self.chess_board.current_player == "black" else "Black"
             QMessageBox.information(self, "Game Over", f"Checkmate! {winner} wins!")
             self.board_view.input_enabled = False
@@ -671,18 +1175,21 @@ class MacanChessWindow(QMainWindow):
         move_coords, is_mate = self.chess_board.make_computer_move()
         
         if move_coords:
+            self.journal.record_move(self.chess_board, *move_coords)
             # Set highlight move terakhir
             self.board_view.last_move = move_coords
             self.board_view.update_board()
             self.update_ui()
             
             if is_mate:
+                 self.journal.finish()
                  QMessageBox.information(self, "Game Over", f"Checkmate! Computer wins!")
             else:
                 self.board_view.input_enabled = True # Buka kunci
                 self.status_lbl.setText("White's Turn (You)")
         else:
             # Stalemate / Draw situation logic simple
+            self.journal.finish()
             QMessageBox.information(self, "Game Over", "Stalemate / No moves left!")
 
     def update_ui(self):
@@ -723,6 +1230,7 @@ class MacanChessWindow(QMainWindow):
                 with open(filename, 'r') as f:
                     data = json.load(f)
                 self.chess_board.load_from_dict(data)
+                self.journal.start(self.chess_board)
                 self.board_view.update_board()
                 self.board_view.last_move = None
                 self.board_view.clear_selection()
@@ -742,6 +1250,10 @@ class MacanChessWindow(QMainWindow):
             self.ask_game_mode()
             self.update_ui()
 
+    def closeEvent(self, event):
+        self.journal.close()
+        super().closeEvent(event)
+
 if __name__ == '__main__':
     app = QApplication(sys.argv)
     app.setStyle('Fusion')
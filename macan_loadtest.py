@@ -0,0 +1,189 @@
+"""
+Macan Chess - Load Test
+Mensimulasikan banyak klien (mode pve) terhadap macan_server di localhost dan
+melaporkan latency ack langkah (p50/p99) serta kedalaman antrian engine.
+
+Pemakaian:
+    python macan_loadtest.py --clients 2000 --plies 10
+    python macan_loadtest.py --spawn-server --workers 4 --clients 1000
+"""
+
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+
+from macan_server import (DEFAULT_HOST, DEFAULT_PORT, DEFAULT_MAX_QUEUE, DEFAULT_MOVE_TIMEOUT,
+                          DEFAULT_GAME_BUDGET, percentile, serve)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+RETRY_BACKOFF = 0.05
+MAX_RETRY_BACKOFF = 2.0
+
+
+class LoadClient:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.next_id = 1
+
+    async def request(self, message):
+        """Kirim request dan tunggu response-nya (event engine disimpan terpisah)"""
+        message['id'] = self.next_id
+        self.next_id += 1
+        self.writer.write(json.dumps(message).encode() + b'\n')
+        await self.writer.drain()
+        while True:
+            reply = json.loads(await self.reader.readline())
+            if reply.get('id') == message['id']:
+                return reply
+
+    async def wait_event(self):
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                raise ConnectionError("server closed connection")
+            reply = json.loads(line)
+            if 'event' in reply:
+                return reply
+
+
+async def run_client(host, port, plies, stats, rng, connect_gate):
+    # Koneksi dibuka bertahap supaya backlog listen tidak meluap
+    async with connect_gate:
+        reader, writer = await asyncio.open_connection(host, port)
+    client = LoadClient(reader, writer)
+    try:
+        game = (await client.request({'op': 'new', 'mode': 'pve'}))['game']
+        for _ in range(plies):
+            moves = (await client.request({'op': 'moves', 'game': game}))['moves']
+            if not moves:
+                break
+            move = rng.choice(moves)
+            backoff = RETRY_BACKOFF
+            while True:
+                sent = time.perf_counter()
+                reply = await client.request({'op': 'move', 'game': game, 'move': move})
+                stats['ack_ms'].append((time.perf_counter() - sent) * 1000)
+                if not reply.get('busy'):
+                    break
+                # Antrian engine penuh: mundur eksponensial + jitter agar tidak terjadi retry storm
+                stats['busy'] += 1
+                await asyncio.sleep(backoff * (0.5 + rng.random()))
+                backoff = min(backoff * 2, MAX_RETRY_BACKOFF)
+            if not reply['ok']:
+                stats['errors'] += 1
+                break
+            if reply['mate']:
+                break
+            event = await client.wait_event()
+            stats['engine_moves'] += 1
+            if event['mate'] or event['move'] is None:
+                break
+        stats['completed'] += 1
+    except (ConnectionError, OSError, json.JSONDecodeError):
+        stats['errors'] += 1
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def sample_queue_depth(host, port, samples, stop):
+    reader, writer = await asyncio.open_connection(host, port)
+    client = LoadClient(reader, writer)
+    try:
+        while not stop.is_set():
+            reply = await client.request({'op': 'stats'})
+            samples.append(reply['stats']['engine_queue_depth'])
+            await asyncio.sleep(0.1)
+        # Tunggu server selesai menutup koneksi klien lain sebelum dihentikan
+        for _ in range(50):
+            stats = (await client.request({'op': 'stats'}))['stats']
+            if stats['connections'] <= 1:
+                break
+            await asyncio.sleep(0.05)
+        return stats
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+def _raise_fd_limit(clients):
+    if resource is None:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    wanted = min(hard, max(soft, clients * 2 + 256))
+    if wanted > soft:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (wanted, hard))
+
+
+async def load_test(args):
+    server_task = None
+    if args.spawn_server:
+        ready = asyncio.Event()
+        server_task = asyncio.create_task(serve(args.host, args.port, args.workers, args.max_queue,
+                                                args.move_timeout, args.game_budget, ready))
+        await ready.wait()
+
+    stats = {'ack_ms': [], 'busy': 0, 'errors': 0, 'completed': 0, 'engine_moves': 0}
+    depth_samples = []
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(sample_queue_depth(args.host, args.port, depth_samples, stop))
+
+    connect_gate = asyncio.Semaphore(args.connect_rate)
+    started = time.perf_counter()
+    await asyncio.gather(*(run_client(args.host, args.port, args.plies, stats, random.Random(i), connect_gate)
+                           for i in range(args.clients)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    server_stats = await sampler
+
+    if server_task:
+        # Beri kesempatan handler server memproses EOF koneksi sampler
+        await asyncio.sleep(0.1)
+        server_task.cancel()
+        await asyncio.gather(server_task, return_exceptions=True)
+
+    acks = stats['ack_ms']
+    print(f"clients            {args.clients} ({stats['completed']} completed, {stats['errors']} errors)")
+    print(f"duration           {elapsed:.2f} s")
+    print(f"moves acked        {len(acks)} ({len(acks) / elapsed:.0f}/s), busy retries {stats['busy']}")
+    print(f"engine moves       {stats['engine_moves']}")
+    print(f"client ack p50     {percentile(acks, 50):.2f} ms")
+    print(f"client ack p99     {percentile(acks, 99):.2f} ms")
+    print(f"server ack p50     {server_stats['move_ack_p50_ms']:.2f} ms")
+    print(f"server ack p99     {server_stats['move_ack_p99_ms']:.2f} ms")
+    print(f"queue depth p50    {percentile(depth_samples, 50)}")
+    print(f"queue depth max    {server_stats['engine_queue_max_depth']}")
+    print(f"engine timeouts    {server_stats['engine_timeouts']}")
+    print(f"engine skipped     {server_stats['engine_skipped']}")
+    print(f"budget fallbacks   {server_stats['budget_fallbacks']}")
+    return 1 if stats['errors'] else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Macan Chess server load test")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--clients', type=int, default=1000, help="jumlah klien simultan")
+    parser.add_argument('--plies', type=int, default=10, help="langkah per klien")
+    parser.add_argument('--connect-rate', type=int, default=200, help="koneksi baru paralel maksimum")
+    parser.add_argument('--spawn-server', action='store_true', help="jalankan server di proses ini")
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--max-queue', type=int, default=DEFAULT_MAX_QUEUE)
+    parser.add_argument('--move-timeout', type=float, default=DEFAULT_MOVE_TIMEOUT)
+    parser.add_argument('--game-budget', type=float, default=DEFAULT_GAME_BUDGET)
+    args = parser.parse_args(argv)
+
+    _raise_fd_limit(args.clients)
+    return asyncio.run(load_test(args))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
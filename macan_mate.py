@@ -0,0 +1,104 @@
+"""
+Macan Chess - Mate Solver CLI
+Menyelesaikan file puzzle secara paralel dengan MateSolver (df-pn).
+
+Format file puzzle:
+    *.json  : file save dari tombol Save (hasil to_dict)
+    lainnya : satu FEN per baris (baris kosong dan '#' diabaikan)
+
+Pemakaian:
+    python macan_mate.py puzzles.txt --moves 3
+    python macan_mate.py puzzles.txt game.json --jobs 4 --nodes 500000
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from macan_chess import ChessBoard, MateSolver, MATE_SEARCH_MOVES
+
+DEFAULT_NODES = 1000000
+
+
+def square_name(r, c):
+    return f"{chr(c + 97)}{8 - r}"
+
+
+def load_puzzles(paths):
+    """Kembalikan daftar (label, jenis, data) dari file-file puzzle"""
+    puzzles = []
+    for path in paths:
+        if path.endswith('.json'):
+            with open(path, 'r') as f:
+                puzzles.append((path, 'dict', json.load(f)))
+            continue
+        with open(path, 'r') as f:
+            for lineno, line in enumerate(f, 1):
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    puzzles.append((f"{path}:{lineno}", 'fen', line))
+    return puzzles
+
+
+def solve_puzzle(puzzle, max_moves, max_nodes, max_entries):
+    label, kind, data = puzzle
+    board = ChessBoard()
+    try:
+        if kind == 'dict':
+            board.load_from_dict(data)
+        else:
+            board.load_from_fen(data)
+    except (ValueError, KeyError, TypeError, IndexError, AttributeError) as e:
+        # Satu puzzle rusak tidak boleh menghentikan seluruh batch di executor.map
+        return label, 'error', None, None, 0, 0.0, f"{type(e).__name__}: {e}"
+
+    started = time.perf_counter()
+    solver = MateSolver(board, max_nodes=max_nodes, max_entries=max_entries)
+    status, move, mate_in = solver.solve(board.current_player, max_moves)
+    return label, status, move, mate_in, solver.nodes, time.perf_counter() - started, None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Macan Chess forced-mate solver")
+    parser.add_argument('files', nargs='+', help="file puzzle (FEN per baris atau save .json)")
+    parser.add_argument('--moves', type=int, default=MATE_SEARCH_MOVES, help="cari mat sampai N langkah")
+    parser.add_argument('--nodes', type=int, default=DEFAULT_NODES, help="batas node per puzzle")
+    parser.add_argument('--table', type=int, default=200000, help="ukuran maksimum tabel transposisi")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help="jumlah proses paralel")
+    args = parser.parse_args(argv)
+
+    try:
+        puzzles = load_puzzles(args.files)
+    except (OSError, ValueError) as e:
+        print(f"Could not load puzzles: {e}", file=sys.stderr)
+        return 2
+
+    counts = {'proven': 0, 'disproven': 0, 'unknown': 0, 'error': 0}
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        results = executor.map(solve_puzzle, puzzles,
+                               [args.moves] * len(puzzles),
+                               [args.nodes] * len(puzzles),
+                               [args.table] * len(puzzles))
+        for label, status, move, mate_in, nodes, elapsed, error in results:
+            counts[status] += 1
+            if status == 'proven':
+                fr, fc, tr, tc = move
+                detail = f"mate in {mate_in}: {square_name(fr, fc)} → {square_name(tr, tc)}"
+            elif status == 'error':
+                detail = error
+            else:
+                detail = f"no mate in {args.moves}" if status == 'disproven' else "node limit reached"
+            print(f"{label}: {status:<9} {detail} ({nodes} nodes, {elapsed:.2f}s)")
+
+    total = time.perf_counter() - started
+    print(f"\n{len(puzzles)} puzzles in {total:.2f}s - "
+          + ", ".join(f"{k} {v}" for k, v in counts.items()))
+    return 1 if counts['error'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
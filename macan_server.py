@@ -0,0 +1,402 @@
+"""
+Macan Chess - Multi-Game Server
+Server asyncio yang menampung banyak permainan ChessBoard sekaligus dalam satu
+proses. Langkah AI dikerjakan oleh process pool terbatas (EnginePool).
+
+Protokol: JSON per baris (newline-delimited) lewat TCP lokal.
+    {"op": "new", "mode": "pve"}                               -> {"ok": true, "game": 1}
+    {"op": "moves", "game": 1}                                 -> {"ok": true, "moves": [[fr, fc, tr, tc], ...]}
+    {"op": "move", "game": 1, "move": [6, 4, 4, 4]}            -> {"ok": true, "mate": false, "turn": "black"}
+    {"op": "state", "game": 1}                                 -> {"ok": true, "state": {...to_dict...}}
+    {"op": "close", "game": 1}                                 -> {"ok": true}
+    {"op": "stats"}                                            -> {"ok": true, "stats": {...}}
+Field "id" pada request (opsional) dikembalikan apa adanya di response.
+Langkah komputer (mode pve) dikirim sebagai event:
+    {"event": "engine_move", "game": 1, "move": [1, 4, 3, 4], "mate": false, "fallback": false}
+
+Pemakaian:
+    python macan_server.py --port 8765 --workers 4
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from macan_chess import ChessBoard
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_MAX_QUEUE = 1024
+DEFAULT_MOVE_TIMEOUT = 2.0      # batas waktu satu langkah AI (detik)
+DEFAULT_GAME_BUDGET = 60.0      # total waktu AI per permainan (detik)
+DEFAULT_MAX_GAMES = 8           # permainan terbuka per koneksi
+LATENCY_SAMPLES = 20000
+
+
+class ServerBusy(Exception):
+    """Antrian engine penuh (backpressure)"""
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def _warmup_worker():
+    return os.getpid()
+
+
+def _engine_worker(data, time_limit):
+    """Dijalankan di process pool: hitung langkah AI dari snapshot to_dict"""
+    board = ChessBoard()
+    board.load_from_dict(data)
+    # Batas waktu diteruskan ke pencarian supaya worker berhenti sebelum timeout
+    move_coords, _ = board.make_computer_move(time_limit=time_limit)
+    return move_coords
+
+
+class EngineJob:
+    def __init__(self, game, timeout):
+        self.game = game
+        self.timeout = timeout
+        self.future = asyncio.get_running_loop().create_future()
+
+
+class EnginePool:
+    """Process pool dengan antrian FIFO terbatas.
+
+    Setiap game hanya boleh punya satu job aktif, sehingga urutan FIFO sama
+    dengan round-robin antar game. Jumlah dispatcher = jumlah worker, jadi
+    executor tidak pernah menerima lebih banyak job dari yang bisa dikerjakan.
+    """
+    def __init__(self, workers, max_queue=DEFAULT_MAX_QUEUE):
+        self.workers = workers
+        # 'spawn': worker tidak mewarisi socket klien / event loop dari proses server
+        self.executor = ProcessPoolExecutor(max_workers=workers,
+                                            mp_context=multiprocessing.get_context('spawn'))
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        self.in_flight = 0
+        self.max_depth = 0
+        self.timeouts = 0
+        self.completed = 0
+        self.skipped = 0
+        self._tasks = []
+
+    async def start(self):
+        # Hidupkan semua worker di awal supaya langkah AI pertama tidak menunggu proses baru
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.executor, _warmup_worker)
+                               for _ in range(self.workers)))
+        for _ in range(self.workers):
+            self._tasks.append(asyncio.create_task(self._dispatch()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    @property
+    def depth(self):
+        return self.queue.qsize() + self.in_flight
+
+    def submit(self, game, timeout):
+        """Masukkan job ke antrian, raise ServerBusy jika penuh"""
+        job = EngineJob(game, timeout)
+        try:
+            self.queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise ServerBusy("engine queue full")
+        self.max_depth = max(self.max_depth, self.depth)
+        return job.future
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self.queue.get()
+            self.in_flight += 1
+            try:
+                if job.game.closed:
+                    # Klien sudah pergi / menutup game: jangan habiskan worker untuknya
+                    self.skipped += 1
+                    if not job.future.done():
+                        job.future.set_result((None, False))
+                    continue
+                data = job.game.board.to_dict()
+                started = time.perf_counter()
+                work = loop.run_in_executor(self.executor, _engine_worker, data, job.timeout)
+                try:
+                    result = await asyncio.wait_for(asyncio.shield(work), job.timeout)
+                    timed_out = False
+                except asyncio.TimeoutError:
+                    result, timed_out = None, True
+                    self.timeouts += 1
+                job.game.engine_time += time.perf_counter() - started
+                if not job.future.done():
+                    job.future.set_result((result, timed_out))
+                if timed_out:
+                    # Worker tetap sibuk sampai selesai; slot baru dilepas setelahnya
+                    await asyncio.gather(work, return_exceptions=True)
+                self.completed += 1
+            except Exception as e:
+                if not job.future.done():
+                    job.future.set_exception(e)
+            finally:
+                self.in_flight -= 1
+                self.queue.task_done()
+
+
+class GameSession:
+    def __init__(self, game_id, mode, writer, budget):
+        self.id = game_id
+        self.board = ChessBoard()
+        self.board.game_mode = mode
+        self.writer = writer
+        self.budget = budget
+        self.engine_time = 0.0
+        self.engine_pending = False
+        self.finished = False
+        self.closed = False
+
+    def budget_left(self):
+        return self.budget - self.engine_time
+
+    def move_timeout(self, cap):
+        return max(0.05, min(cap, self.budget_left()))
+
+
+class MacanServer:
+    def __init__(self, pool, move_timeout=DEFAULT_MOVE_TIMEOUT, game_budget=DEFAULT_GAME_BUDGET,
+                 max_games=DEFAULT_MAX_GAMES):
+        self.pool = pool
+        self.move_timeout = move_timeout
+        self.game_budget = game_budget
+        self.max_games = max_games
+        self.games = {}
+        self.next_id = 1
+        self.connections = 0
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.busy_rejects = 0
+        self.budget_fallbacks = 0
+
+    # --- KONEKSI ---
+    async def handle_client(self, reader, writer):
+        self.connections += 1
+        owned = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    # Baris melebihi batas buffer StreamReader: balas error lalu tutup koneksi
+                    await self._send(writer, {'ok': False, 'error': "request line too long"})
+                    break
+                if not line:
+                    break
+                received = time.perf_counter()
+                request = {}
+                try:
+                    request = json.loads(line)
+                    response = self.handle_request(request, writer, owned)
+                except ServerBusy as e:
+                    self.busy_rejects += 1
+                    response = {'ok': False, 'error': str(e), 'busy': True}
+                except (ValueError, KeyError, TypeError) as e:
+                    response = {'ok': False, 'error': str(e)}
+                if not isinstance(request, dict):
+                    request = {}
+                if 'id' in request:
+                    response['id'] = request['id']
+                await self._send(writer, response)
+                if request.get('op') == 'move':
+                    self.latencies.append((time.perf_counter() - received) * 1000)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.connections -= 1
+            for game_id in owned:
+                self._close_game(game_id)
+            writer.close()
+
+    async def _send(self, writer, message):
+        if writer.is_closing():
+            return
+        writer.write(json.dumps(message).encode() + b'\n')
+        # drain() = backpressure ke klien yang lambat membaca
+        await writer.drain()
+
+    # --- REQUEST ---
+    def handle_request(self, request, writer, owned):
+        op = request['op']
+        if op == 'new':
+            mode = request.get('mode', 'pvp')
+            if mode not in ('pvp', 'pve'):
+                raise ValueError(f"unknown mode: {mode}")
+            if len(owned) >= self.max_games:
+                # Batas per koneksi: satu klien tidak boleh memenuhi antrian engine sendirian
+                raise ValueError(f"too many open games on this connection (max {self.max_games})")
+            game = GameSession(self.next_id, mode, writer, self.game_budget)
+            self.next_id += 1
+            self.games[game.id] = game
+            owned.add(game.id)
+            return {'ok': True, 'game': game.id}
+        if op == 'stats':
+            return {'ok': True, 'stats': self.stats()}
+
+        game = self._get_game(request, owned)
+        if op == 'moves':
+            moves = game.board.get_all_valid_moves(game.board.current_player)
+            return {'ok': True, 'moves': [[fr, fc, tr, tc] for (fr, fc), (tr, tc) in moves]}
+        if op == 'state':
+            return {'ok': True, 'state': game.board.to_dict()}
+        if op == 'close':
+            self._close_game(game.id)
+            owned.discard(game.id)
+            return {'ok': True}
+        if op == 'move':
+            return self._play_move(game, request['move'])
+        raise ValueError(f"unknown op: {op}")
+
+    def _close_game(self, game_id):
+        game = self.games.pop(game_id, None)
+        if game is not None:
+            # Job engine yang masih antri akan dilewati oleh dispatcher
+            game.closed = True
+
+    def _get_game(self, request, owned):
+        game_id = request['game']
+        if game_id not in owned or game_id not in self.games:
+            raise KeyError(f"unknown game: {game_id}")
+        return self.games[game_id]
+
+    def _play_move(self, game, move):
+        board = game.board
+        if game.finished:
+            raise ValueError("game is over")
+        if game.engine_pending or (board.game_mode == 'pve' and board.current_player == 'black'):
+            raise ValueError("not your turn")
+        if (not isinstance(move, list) or len(move) != 4
+                or not all(isinstance(v, int) and not isinstance(v, bool) for v in move)):
+            raise ValueError("move must be a list of 4 integers")
+        fr, fc, tr, tc = move
+        piece = board.get_piece(fr, fc)
+        if not piece or piece.color != board.current_player or (tr, tc) not in board.get_valid_moves(fr, fc):
+            raise ValueError("illegal move")
+
+        needs_engine = board.game_mode == 'pve'
+        use_pool = needs_engine and game.budget_left() > 0
+        if use_pool and self.pool.queue.full():
+            # Tolak sebelum papan berubah supaya klien bisa mengulang langkah yang sama
+            raise ServerBusy("engine queue full")
+
+        _, is_mate = board.move_piece(fr, fc, tr, tc)
+        game.finished = is_mate
+        if needs_engine and not is_mate:
+            game.engine_pending = True
+            if use_pool:
+                future = self.pool.submit(game, game.move_timeout(self.move_timeout))
+            else:
+                # Budget AI habis: langsung pakai langkah cadangan tanpa memakai pool
+                self.budget_fallbacks += 1
+                future = asyncio.get_running_loop().create_future()
+                future.set_result((None, True))
+            asyncio.create_task(self._finish_engine_move(game, future))
+        return {'ok': True, 'mate': is_mate, 'turn': board.current_player}
+
+    async def _finish_engine_move(self, game, future):
+        try:
+            move_coords, timed_out = await future
+        except Exception as e:
+            move_coords, timed_out = None, False
+            print(f"Engine error game {game.id}: {e}", file=sys.stderr)
+        if game.closed:
+            return
+
+        board = game.board
+        if move_coords is None:
+            # Waktu habis: pakai langkah legal acak agar permainan tetap jalan
+            moves = board.get_all_valid_moves('black')
+            if moves:
+                (fr, fc), (tr, tc) = random.choice(moves)
+                move_coords = (fr, fc, tr, tc)
+
+        event = {'event': 'engine_move', 'game': game.id, 'fallback': timed_out}
+        if move_coords is None:
+            game.finished = True
+            event.update({'move': None, 'mate': False, 'stalemate': True})
+        else:
+            _, is_mate = board.move_piece(*move_coords)
+            game.finished = is_mate
+            event.update({'move': list(move_coords), 'mate': is_mate})
+        game.engine_pending = False
+        try:
+            await self._send(game.writer, event)
+        except ConnectionError:
+            pass
+
+    def stats(self):
+        samples = list(self.latencies)
+        return {
+            'games': len(self.games),
+            'connections': self.connections,
+            'engine_queue_depth': self.pool.depth,
+            'engine_queue_max_depth': self.pool.max_depth,
+            'engine_completed': self.pool.completed,
+            'engine_timeouts': self.pool.timeouts,
+            'engine_skipped': self.pool.skipped,
+            'busy_rejects': self.busy_rejects,
+            'budget_fallbacks': self.budget_fallbacks,
+            'move_ack_p50_ms': round(percentile(samples, 50), 3),
+            'move_ack_p99_ms': round(percentile(samples, 99), 3),
+        }
+
+
+async def serve(host, port, workers, max_queue, move_timeout, game_budget, ready=None,
+                max_games=DEFAULT_MAX_GAMES):
+    pool = EnginePool(workers, max_queue)
+    await pool.start()
+    server = MacanServer(pool, move_timeout, game_budget, max_games)
+    tcp = await asyncio.start_server(server.handle_client, host, port, backlog=4096)
+    print(f"Macan Chess server listening on {host}:{port} ({workers} engine workers)")
+    if ready is not None:
+        ready.set()
+    try:
+        async with tcp:
+            await tcp.serve_forever()
+    finally:
+        await pool.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Macan Chess multi-game server")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2, help="jumlah proses engine")
+    parser.add_argument('--max-queue', type=int, default=DEFAULT_MAX_QUEUE, help="batas antrian engine")
+    parser.add_argument('--move-timeout', type=float, default=DEFAULT_MOVE_TIMEOUT,
+                        help="batas waktu satu langkah AI (detik)")
+    parser.add_argument('--game-budget', type=float, default=DEFAULT_GAME_BUDGET,
+                        help="total waktu AI per permainan (detik)")
+    parser.add_argument('--max-games', type=int, default=DEFAULT_MAX_GAMES,
+                        help="permainan terbuka maksimum per koneksi")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.max_queue,
+                          args.move_timeout, args.game_budget, max_games=args.max_games))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
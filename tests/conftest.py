@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Modul aplikasi ada di root repo (tanpa paket)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
@@ -0,0 +1,27 @@
+from macan_bench import compare_with_baseline, METRIC_THRESHOLDS
+
+
+def test_fast_metrics_use_relative_threshold():
+    results = {'journal_move_ms': 0.060, 'dict_roundtrip_ms': 0.080}
+    baseline = {'journal_move_ms': 0.019, 'dict_roundtrip_ms': 0.034}
+    regressions = compare_with_baseline(results, baseline, 0.25)
+    assert [name for name, _, _ in regressions] == ['journal_move_ms', 'dict_roundtrip_ms']
+
+
+def test_within_threshold_is_not_a_regression():
+    assert compare_with_baseline({'is_check_ms': 0.09}, {'is_check_ms': 0.075}, 0.25) == []
+    assert compare_with_baseline({'is_check_ms': 0.1}, {'is_check_ms': 0.075}, 0.25) == [
+        ('is_check_ms', 0.075, 0.1)]
+
+
+def test_metric_threshold_overrides_smaller_cli_threshold():
+    limit = METRIC_THRESHOLDS['render_frame_ms']
+    base = 4.0
+    assert compare_with_baseline({'render_frame_ms': base * (1 + limit) * 0.99},
+                                 {'render_frame_ms': base}, 0.25) == []
+    assert compare_with_baseline({'render_frame_ms': base * (1 + limit) * 1.01},
+                                 {'render_frame_ms': base}, 0.25) != []
+
+
+def test_metrics_missing_from_baseline_are_skipped():
+    assert compare_with_baseline({'mate_solve_ms': 100.0}, {}, 0.25) == []
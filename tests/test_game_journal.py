@@ -0,0 +1,184 @@
+import json
+import random
+
+import pytest
+
+from macan_chess import (ChessBoard, GameJournal, CHECKPOINT_INTERVAL, JOURNAL_HEADER,
+                         JOURNAL_MAGIC, JOURNAL_RECORD_SIZE)
+
+PLIES = CHECKPOINT_INTERVAL + 8
+
+
+def snapshot(board):
+    return json.loads(json.dumps(board.to_dict()))
+
+
+@pytest.fixture
+def played(tmp_path):
+    """Mainkan PLIES langkah acak dengan jurnal, lalu 'crash' tanpa close()"""
+    rng = random.Random(7)
+    board = ChessBoard()
+    journal = GameJournal(tmp_path)
+    journal.start(board)
+    states = [snapshot(board)]
+    for _ in range(PLIES):
+        (fr, fc), (tr, tc) = rng.choice(board.get_all_valid_moves(board.current_player))
+        board.move_piece(fr, fc, tr, tc)
+        journal.record_move(board, fr, fc, tr, tc)
+        states.append(snapshot(board))
+    journal.file.flush()
+    return journal, states
+
+
+def record_offset(index):
+    return JOURNAL_HEADER.size + index * JOURNAL_RECORD_SIZE
+
+
+def resume(journal):
+    board = ChessBoard()
+    replayed = GameJournal(journal.directory).resume(board)
+    return board, replayed
+
+
+def test_checkpoint_records_offset_and_seq(played):
+    journal, _ = played
+    with open(journal.checkpoint_path) as f:
+        checkpoint = json.load(f)
+    assert checkpoint['seq'] == CHECKPOINT_INTERVAL
+    assert checkpoint['offset'] == record_offset(CHECKPOINT_INTERVAL)
+    assert checkpoint['epoch'] == journal.epoch
+    assert checkpoint['history_len'] == CHECKPOINT_INTERVAL
+    assert 'history' not in checkpoint['state']
+    assert journal.journal_path.stat().st_size == record_offset(PLIES)
+
+
+def test_resume_replays_tail_after_checkpoint(played):
+    journal, states = played
+    board, replayed = resume(journal)
+    assert len(replayed) == PLIES - CHECKPOINT_INTERVAL
+    assert snapshot(board) == states[-1]
+
+
+def test_torn_tail_is_ignored(played):
+    journal, states = played
+    with open(journal.journal_path, 'r+b') as f:
+        f.truncate(record_offset(PLIES) - 5)
+    board, replayed = resume(journal)
+    assert len(replayed) == PLIES - CHECKPOINT_INTERVAL - 1
+    assert snapshot(board) == states[-2]
+
+
+def test_replay_stops_at_bad_crc(played):
+    journal, states = played
+    bad = CHECKPOINT_INTERVAL + 3
+    with open(journal.journal_path, 'r+b') as f:
+        f.seek(record_offset(bad) + 2)
+        byte = f.read(1)
+        f.seek(-1, 1)
+        f.write(bytes([byte[0] ^ 0xFF]))
+    board, replayed = resume(journal)
+    assert len(replayed) == 3
+    assert snapshot(board) == states[bad]
+
+
+def test_epoch_mismatch_replays_nothing(played):
+    # Jurnal milik permainan lain (crash sebelum header jurnal baru tertulis)
+    journal, states = played
+    with open(journal.journal_path, 'r+b') as f:
+        f.write(JOURNAL_HEADER.pack(JOURNAL_MAGIC, journal.epoch + 1))
+    board, replayed = resume(journal)
+    assert replayed == []
+    assert snapshot(board) == states[CHECKPOINT_INTERVAL]
+
+
+def find_piece(state, piece_type):
+    return next(p for row in state['board'] for p in row if p and p['type'] == piece_type)
+
+
+@pytest.mark.parametrize('content', [
+    '{"state": []}',
+    '{"state": null}',
+    '{"epoch": 1}',
+    '[]',
+    '{broken',
+    # Checkpoint valid dengan satu bagian state yang rusak
+    lambda state: state.pop('captured_w'),
+    lambda state: find_piece(state, 'N').update(type='X'),
+    lambda state: find_piece(state, 'N').update(type=7),
+    lambda state: find_piece(state, 'Q').update(color='green'),
+    lambda state: state.update(captured_b=['Z']),
+    lambda state: find_piece(state, 'K').update(type='Q'),
+    lambda state: state.update(turn='red'),
+])
+def test_bad_checkpoint_resets_board(played, content):
+    journal, _ = played
+    if isinstance(content, str):
+        journal.checkpoint_path.write_text(content)
+    else:
+        with open(journal.checkpoint_path) as f:
+            checkpoint = json.load(f)
+        content(checkpoint['state'])
+        with open(journal.checkpoint_path, 'w') as f:
+            json.dump(checkpoint, f)
+    board = ChessBoard()
+    board.move_piece(6, 4, 4, 4)
+    assert GameJournal(journal.directory).resume(board) is None
+    assert snapshot(board) == snapshot(ChessBoard())
+
+
+def test_checkpoint_size_does_not_grow_with_history(tmp_path):
+    sizes = []
+    for plies in (40, 4000):
+        board = ChessBoard()
+        board.move_history = ['e2 → e4'] * plies
+        journal = GameJournal(tmp_path / str(plies))
+        journal.start(board)
+        for _ in range(CHECKPOINT_INTERVAL):
+            board.move_history.append('e2 → e4')
+            journal.record_move(board, 6, 4, 4, 4)
+        journal.close()
+        sizes.append(journal.checkpoint_path.stat().st_size)
+    # Hanya angka history_len / epoch yang berbeda panjangnya
+    assert abs(sizes[0] - sizes[1]) < 16
+
+
+def test_long_history_survives_resume(tmp_path):
+    board = ChessBoard()
+    board.move_history = [f'move {i}' for i in range(500)]
+    journal = GameJournal(tmp_path)
+    journal.start(board)
+    board.move_piece(6, 4, 4, 4)
+    journal.record_move(board, 6, 4, 4, 4)
+    journal.close()
+    restored = ChessBoard()
+    assert GameJournal(tmp_path).resume(restored) == [(6, 4, 4, 4)]
+    assert restored.move_history == board.move_history
+
+
+def test_fresh_game_has_nothing_to_resume(tmp_path):
+    assert GameJournal(tmp_path).resume(ChessBoard()) is None
+    journal = GameJournal(tmp_path)
+    journal.start(ChessBoard())
+    journal.close()
+    assert GameJournal(tmp_path).resume(ChessBoard()) is None
+
+
+def test_sync_pending_flushes_unsynced_moves(tmp_path):
+    board = ChessBoard()
+    journal = GameJournal(tmp_path)
+    journal.start(board)
+    board.move_piece(6, 4, 4, 4)
+    journal.record_move(board, 6, 4, 4, 4)
+    assert journal.unsynced == 1
+    journal.sync_pending()
+    assert journal.unsynced == 0
+    journal.close()
+
+
+def test_finish_removes_files(played):
+    journal, _ = played
+    journal.finish()
+    assert not journal.journal_path.exists()
+    assert not journal.checkpoint_path.exists()
+    assert list(journal.directory.glob('*.history')) == []
+    assert GameJournal(journal.directory).resume(ChessBoard()) is None
@@ -0,0 +1,34 @@
+import json
+
+import pytest
+
+from macan_chess import ChessBoard
+from macan_mate import main, solve_puzzle
+
+
+def saved_game(**changes):
+    data = json.loads(json.dumps(ChessBoard().to_dict()))
+    data.update(changes)
+    return data
+
+
+@pytest.mark.parametrize('puzzle', [
+    ('short', 'dict', saved_game(board=saved_game()['board'][:7])),
+    ('bad piece', 'dict', saved_game(board=[[1] * 8] * 8)),
+    ('missing key', 'dict', {'turn': 'white'}),
+    ('no king', 'fen', '8/8/8/8/8/8/8/R7 w'),
+])
+def test_broken_puzzle_is_reported_as_error(puzzle):
+    label, status, move, mate_in, nodes, elapsed, error = solve_puzzle(puzzle, 1, 1000, 1000)
+    assert (label, status, move) == (puzzle[0], 'error', None)
+    assert error
+
+
+def test_broken_puzzle_does_not_stop_batch(tmp_path, capsys):
+    broken = tmp_path / 'broken.json'
+    broken.write_text(json.dumps(saved_game(board=saved_game()['board'][:7])))
+    fens = tmp_path / 'puzzles.txt'
+    fens.write_text('6k1/8/6K1/8/8/8/8/R7 w\n')
+    assert main([str(broken), str(fens), '--moves', '1', '--jobs', '1']) == 1
+    out = capsys.readouterr().out
+    assert 'error' in out and 'mate in 1' in out
@@ -0,0 +1,140 @@
+import random
+
+import pytest
+
+from macan_chess import ChessBoard, MateSolver
+
+
+def board_from_fen(fen):
+    board = ChessBoard()
+    board.load_from_fen(fen)
+    return board
+
+
+def brute_force_mate_in(board, attacker, max_moves):
+    """Mat terpendek (dalam langkah) lewat minimax penuh, atau None"""
+    defender = 'black' if attacker == 'white' else 'white'
+
+    def attack(n):
+        for (fr, fc), (tr, tc) in board.get_all_valid_moves(attacker):
+            undo = board._make_temp_move(fr, fc, tr, tc)
+            try:
+                if defend(n):
+                    return True
+            finally:
+                board._undo_temp_move(fr, fc, tr, tc, undo)
+        return False
+
+    def defend(n):
+        moves = board.get_all_valid_moves(defender)
+        if not moves:
+            return board.is_check(defender)  # stalemate bukan mat
+        if n == 1:
+            return False
+        for (fr, fc), (tr, tc) in moves:
+            undo = board._make_temp_move(fr, fc, tr, tc)
+            try:
+                if not attack(n - 1):
+                    return False
+            finally:
+                board._undo_temp_move(fr, fc, tr, tc, undo)
+        return True
+
+    for n in range(1, max_moves + 1):
+        if attack(n):
+            return n
+    return None
+
+
+@pytest.mark.parametrize('fen, mate_in, move', [
+    ('6k1/8/6K1/8/8/8/8/R7 w', 1, (7, 0, 0, 0)),             # Ra8#
+    ('4r2k/6pp/7N/3Q4/8/8/8/6K1 w', 2, (3, 3, 0, 6)),         # Qg8+ Rxg8 Nf7#
+    ('8/8/8/8/8/6k1/R7/1R4K1 w', 3, None),
+])
+def test_finds_shortest_mate(fen, mate_in, move):
+    board = board_from_fen(fen)
+    status, found, n = MateSolver(board).solve('white', 3)
+    assert status == 'proven'
+    assert n == mate_in
+    if move:
+        assert found == move
+    assert brute_force_mate_in(board, 'white', mate_in) == mate_in
+
+
+def test_solver_restores_board():
+    board = board_from_fen('8/8/8/8/8/6k1/R7/1R4K1 w')
+    before = board.to_dict()
+    kings = dict(board.king_positions)
+    MateSolver(board).solve('white', 3)
+    assert board.to_dict() == before
+    assert board.king_positions == kings
+
+
+@pytest.mark.parametrize('max_entries', [8, 64, 1000])
+def test_small_table_still_proves_mate(max_entries):
+    board = board_from_fen('8/8/8/8/8/6k1/R7/1R4K1 w')
+    solver = MateSolver(board, max_nodes=20000, max_entries=max_entries)
+    assert solver.solve('white', 3)[0] == 'proven'
+    assert len(solver.table) <= max_entries
+
+
+def test_stalemate_is_not_mate():
+    # Kf8 membuat stalemate; tidak ada mat dalam 1
+    board = board_from_fen('7k/5K2/6P1/8/8/8/8/8 w')
+    assert MateSolver(board).solve('white', 1) == ('disproven', None, None)
+
+
+def test_no_mate_is_disproven():
+    board = board_from_fen('rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w')
+    assert MateSolver(board).solve('white', 1) == ('disproven', None, None)
+
+
+def test_node_limit_returns_unknown():
+    board = board_from_fen('8/8/8/8/8/6k1/R7/1R4K1 w')
+    before = board.to_dict()
+    assert MateSolver(board, max_nodes=10).solve('white', 3) == ('unknown', None, None)
+    assert board.to_dict() == before
+
+
+def test_time_limit_returns_unknown():
+    board = board_from_fen('8/8/8/8/8/6k1/R7/1R4K1 w')
+    assert MateSolver(board, time_limit=0).solve('white', 3) == ('unknown', None, None)
+
+
+def test_matches_brute_force_on_random_positions():
+    rng = random.Random(2024)
+    checked = 0
+    while checked < 12:
+        board = ChessBoard()
+        for _ in range(rng.randint(10, 60)):
+            moves = board.get_all_valid_moves(board.current_player)
+            if not moves:
+                break
+            (fr, fc), (tr, tc) = rng.choice(moves)
+            board.move_piece(fr, fc, tr, tc)
+        color = board.current_player
+        if not board.get_all_valid_moves(color):
+            continue
+        status, move, n = MateSolver(board).solve(color, 2)
+        assert n == brute_force_mate_in(board, color, 2)
+        assert status == ('proven' if n else 'disproven')
+        checked += 1
+
+
+@pytest.mark.parametrize('fen', [
+    '8/8/8/8/8/8/8/R7 w',                # tanpa raja
+    'k7/8/8/8/8/8/8/R7 w',               # raja putih hilang
+    'k6k/8/8/8/8/8/8/K7 w',              # dua raja hitam
+    '9/8/8/8/8/8/8/K6k w',
+    '7/8/8/8/8/8/8/K6k w',               # rank kurang dari 8 file
+    'k7/8/8/8/8/8/8/K7R w',              # rank lebih dari 8 file
+    'k7/8/8/8/8/8/K7 w',                 # hanya 7 rank
+])
+def test_invalid_fen_is_rejected(fen):
+    with pytest.raises(ValueError):
+        ChessBoard().load_from_fen(fen)
+
+
+def test_fen_sets_king_positions():
+    board = board_from_fen('8/8/8/8/8/6k1/R7/1R4K1 w')
+    assert board.king_positions == {'white': (7, 6), 'black': (5, 6)}
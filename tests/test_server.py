@@ -0,0 +1,245 @@
+import asyncio
+import json
+
+import pytest
+
+from macan_server import EngineJob, EnginePool, GameSession, MacanServer, ServerBusy
+
+
+class StubPool:
+    """Pengganti EnginePool: job hanya diantrikan, diselesaikan manual oleh test"""
+    def __init__(self, max_queue=4):
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        self.jobs = []
+        self.depth = self.max_depth = self.completed = self.timeouts = self.skipped = 0
+
+    def submit(self, game, timeout):
+        job = EngineJob(game, timeout)
+        try:
+            self.queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise ServerBusy("engine queue full")
+        self.jobs.append(job)
+        return job.future
+
+
+class FakeWriter:
+    def __init__(self):
+        self.messages = []
+        self.closed = False
+
+    def is_closing(self):
+        return self.closed
+
+    def write(self, data):
+        self.messages.extend(json.loads(line) for line in data.splitlines())
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+def run(coro_fn, **server_args):
+    """Jalankan coro_fn(server, writer, owned) di event loop baru"""
+    async def main():
+        server = MacanServer(StubPool(server_args.pop('max_queue', 4)), **server_args)
+        return await coro_fn(server, FakeWriter(), set())
+    return asyncio.run(main())
+
+
+async def settle():
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+def new_game(server, writer, owned, mode='pve'):
+    game_id = server.handle_request({'op': 'new', 'mode': mode}, writer, owned)['game']
+    return server.games[game_id]
+
+
+# --- VALIDASI LANGKAH ---
+
+@pytest.mark.parametrize('move', [
+    [6, 4, 4.0, 4],
+    [True, 4, 4, 4],
+    [6, 4, 4],
+    [6, 4, 4, 4, 0],
+    '6444',
+    None,
+    [6, 4, 3, 4],        # pion tidak bisa maju tiga petak
+    [1, 4, 3, 4],        # bidak lawan
+    [4, 4, 3, 4],        # petak kosong
+    [9, 9, 8, 8],
+])
+def test_invalid_move_is_rejected_and_board_unchanged(move):
+    async def scenario(server, writer, owned):
+        game = new_game(server, writer, owned)
+        before = game.board.to_dict()
+        with pytest.raises(ValueError):
+            server.handle_request({'op': 'move', 'game': game.id, 'move': move}, writer, owned)
+        assert game.board.to_dict() == before
+        assert not game.engine_pending
+        assert server.pool.jobs == []
+    run(scenario)
+
+
+def test_move_while_engine_pending_is_rejected():
+    async def scenario(server, writer, owned):
+        game = new_game(server, writer, owned)
+        server.handle_request({'op': 'move', 'game': game.id, 'move': [6, 4, 4, 4]}, writer, owned)
+        with pytest.raises(ValueError, match="not your turn"):
+            server.handle_request({'op': 'move', 'game': game.id, 'move': [6, 3, 4, 3]}, writer, owned)
+    run(scenario)
+
+
+def test_new_rejects_unknown_mode():
+    async def scenario(server, writer, owned):
+        with pytest.raises(ValueError):
+            server.handle_request({'op': 'new', 'mode': 'blitz'}, writer, owned)
+    run(scenario)
+
+
+# --- KEPEMILIKAN GAME ---
+
+def test_game_belongs_to_its_connection():
+    async def scenario(server, writer, owned):
+        game = new_game(server, writer, owned)
+        with pytest.raises(KeyError):
+            server.handle_request({'op': 'state', 'game': game.id}, FakeWriter(), set())
+        with pytest.raises(KeyError):
+            server.handle_request({'op': 'moves', 'game': game.id + 1}, writer, owned)
+        assert server.handle_request({'op': 'state', 'game': game.id}, writer, owned)['ok']
+    run(scenario)
+
+
+def test_closed_game_is_unknown():
+    async def scenario(server, writer, owned):
+        game = new_game(server, writer, owned)
+        server.handle_request({'op': 'close', 'game': game.id}, writer, owned)
+        assert game.closed
+        with pytest.raises(KeyError):
+            server.handle_request({'op': 'moves', 'game': game.id}, writer, owned)
+    run(scenario)
+
+
+def test_games_per_connection_are_capped():
+    async def scenario(server, writer, owned):
+        for _ in range(3):
+            new_game(server, writer, owned)
+        with pytest.raises(ValueError, match="too many"):
+            new_game(server, writer, owned)
+        # Koneksi lain tidak terpengaruh
+        new_game(server, writer, set())
+    run(scenario, max_games=3)
+
+
+# --- ENGINE ---
+
+def test_busy_rejection_leaves_board_unchanged():
+    async def scenario(server, writer, owned):
+        first = new_game(server, writer, owned)
+        second = new_game(server, writer, owned)
+        server.handle_request({'op': 'move', 'game': first.id, 'move': [6, 4, 4, 4]}, writer, owned)
+        before = second.board.to_dict()
+        with pytest.raises(ServerBusy):
+            server.handle_request({'op': 'move', 'game': second.id, 'move': [6, 4, 4, 4]}, writer, owned)
+        assert second.board.to_dict() == before
+        assert not second.engine_pending
+        assert len(server.pool.jobs) == 1
+    run(scenario, max_queue=1)
+
+
+def test_engine_move_is_applied_and_sent():
+    async def scenario(server, writer, owned):
+        game = new_game(server, writer, owned)
+        server.handle_request({'op': 'move', 'game': game.id, 'move': [6, 4, 4, 4]}, writer, owned)
+        (job,) = server.pool.jobs
+        job.future.set_result(((1, 4, 3, 4), False))
+        await settle()
+        assert writer.messages[-1] == {'event': 'engine_move', 'game': game.id, 'fallback': False,
+                                       'move': [1, 4, 3, 4], 'mate': False}
+        assert game.board.current_player == 'white'
+        assert not game.engine_pending
+    run(scenario)
+
+
+def test_spent_budget_skips_pool():
+    async def scenario(server, writer, owned):
+        game = new_game(server, writer, owned)
+        server.handle_request({'op': 'move', 'game': game.id, 'move': [6, 4, 4, 4]}, writer, owned)
+        await settle()
+        assert server.pool.jobs == []
+        assert server.budget_fallbacks == 1
+        event = writer.messages[-1]
+        assert event['fallback'] and event['move'] is not None
+        assert game.board.current_player == 'white'
+    run(scenario, game_budget=0)
+
+
+def test_engine_result_for_closed_game_is_dropped():
+    async def scenario(server, writer, owned):
+        game = new_game(server, writer, owned)
+        server.handle_request({'op': 'move', 'game': game.id, 'move': [6, 4, 4, 4]}, writer, owned)
+        server.handle_request({'op': 'close', 'game': game.id}, writer, owned)
+        server.pool.jobs[0].future.set_result(((1, 4, 3, 4), False))
+        await settle()
+        assert writer.messages == []
+        assert game.board.current_player == 'black'
+    run(scenario)
+
+
+def test_dispatcher_skips_jobs_of_closed_games():
+    async def scenario():
+        pool = EnginePool(1, max_queue=4)
+        try:
+            game = GameSession(1, 'pve', FakeWriter(), 60.0)
+            game.closed = True
+            future = pool.submit(game, 1.0)
+            dispatcher = asyncio.create_task(pool._dispatch())
+            assert await asyncio.wait_for(future, 1.0) == (None, False)
+            assert (pool.skipped, pool.completed, pool.in_flight) == (1, 0, 0)
+            dispatcher.cancel()
+            await asyncio.gather(dispatcher, return_exceptions=True)
+        finally:
+            pool.executor.shutdown(wait=False)
+    asyncio.run(scenario())
+
+
+# --- KONEKSI ---
+
+def client_session(lines, limit=2 ** 16, **server_args):
+    """Kirim baris-baris ke handle_client lalu EOF; kembalikan pesan balasan"""
+    async def scenario(server, writer, owned):
+        reader = asyncio.StreamReader(limit=limit)
+        for line in lines:
+            reader.feed_data(line)
+        reader.feed_eof()
+        await server.handle_client(reader, writer)
+        assert writer.closed
+        assert server.connections == 0
+        return server, writer.messages
+    return run(scenario, **server_args)
+
+
+def test_oversized_line_is_rejected():
+    _, messages = client_session([b'{"op": "stats", "pad": "' + b'x' * 200 + b'"}\n'], limit=64)
+    assert messages == [{'ok': False, 'error': "request line too long"}]
+
+
+def test_bad_requests_get_error_replies():
+    _, messages = client_session([
+        b'not json\n',
+        b'[1, 2]\n',
+        b'{"op": "new", "mode": "pve", "id": 1}\n',
+        b'{"op": "move", "game": 1, "move": [6, 4, 4, false], "id": 2}\n',
+        b'{"op": "fly", "game": 1, "id": 3}\n',
+    ])
+    assert [m['ok'] for m in messages] == [False, False, True, False, False]
+    assert [m.get('id') for m in messages] == [None, None, 1, 2, 3]
+
+
+def test_disconnect_closes_owned_games():
+    server, _ = client_session([b'{"op": "new", "mode": "pve"}\n'])
+    assert server.games == {}